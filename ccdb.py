@@ -8,9 +8,18 @@ from discord import app_commands
 from discord.ext import commands, tasks
 import sqlite3
 import random
+import math
+import bisect
+import string
 import asyncio
 from datetime import datetime, timedelta
 import os
+import sys
+import time
+import inspect
+import threading
+import traceback
+from collections import Counter, ChainMap
 from typing import Optional, Dict, List, Tuple
 import json
 from dotenv import load_dotenv
@@ -28,6 +37,8 @@ tree = app_commands.CommandTree(bot)
 
 # Database setup
 DB_NAME = 'chichi.db'
+TRIVIA_FILE = os.getenv('CHICHI_TRIVIA_FILE', 'trivia.jsonl')
+RESPONSES_DIR = os.getenv('CHICHI_RESPONSES_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'responses'))
 
 def init_db():
     """Initialize the database with all required tables"""
@@ -54,6 +65,23 @@ def init_db():
     c.execute('''CREATE TABLE IF NOT EXISTS blacklist
                  (user_id INTEGER PRIMARY KEY)''')
     
+    # Persona pack per guild
+    c.execute('''CREATE TABLE IF NOT EXISTS guild_personas
+                 (guild_id INTEGER PRIMARY KEY, pack TEXT)''')
+    
+    # Trivia question bank, pos_* is each question's 0-based position within its pool
+    c.execute('''CREATE TABLE IF NOT EXISTS trivia_questions
+                 (id INTEGER PRIMARY KEY, category TEXT, difficulty TEXT, question TEXT, answer TEXT, options TEXT,
+                  pos_all INTEGER, pos_category INTEGER, pos_difficulty INTEGER, pos_both INTEGER)''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_trivia_pos_all ON trivia_questions (pos_all)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_trivia_pos_category ON trivia_questions (category, pos_category)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_trivia_pos_difficulty ON trivia_questions (difficulty, pos_difficulty)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_trivia_pos_both ON trivia_questions (category, difficulty, pos_both)')
+    
+    # Which question file the bank was last loaded from
+    c.execute('''CREATE TABLE IF NOT EXISTS trivia_source
+                 (path TEXT PRIMARY KEY, signature TEXT)''')
+    
     conn.commit()
     conn.close()
 
@@ -67,60 +95,197 @@ class Personality:
         return text.lower()
     
     @staticmethod
-    def react_win() -> str:
-        reactions = [
-            "NO WAY 😭 ok you ate that",
-            "WAIT THAT WAS CRAZY",
-            "ok gg that was actually insane",
-            "nah you're too good at this 😭",
-            "okay okay you got me there"
-        ]
-        return Personality.format_message(random.choice(reactions))
+    def say(key: str, guild_id: Optional[int] = None, **slots) -> str:
+        """Render a catalog line in the guild's persona"""
+        return catalog.render(key, guild_id, **slots)
+    
+    @staticmethod
+    def react_win(guild_id: Optional[int] = None) -> str:
+        return catalog.render('win', guild_id)
+    
+    @staticmethod
+    def react_loss(guild_id: Optional[int] = None) -> str:
+        return catalog.render('loss', guild_id)
     
     @staticmethod
-    def react_loss() -> str:
-        reactions = [
-            "dang... that was close tho 😔",
-            "okay okay next time for sure",
-            "nah that was still fun tho",
-            "ok gg that was close",
-            "aw man 😔 but you'll get em next time"
-        ]
-        return Personality.format_message(random.choice(reactions))
+    def react_tie(guild_id: Optional[int] = None) -> str:
+        return catalog.render('tie', guild_id)
     
     @staticmethod
-    def react_tie() -> str:
-        reactions = [
-            "WAIT NO WAY A TIE 😭",
-            "ok that's actually wild",
-            "nah that's too close to call",
-            "okay okay we're both winners here"
-        ]
-        return Personality.format_message(random.choice(reactions))
+    def react_mistake(guild_id: Optional[int] = None) -> str:
+        return catalog.render('mistake', guild_id)
     
     @staticmethod
-    def react_mistake() -> str:
-        reactions = [
-            "WAIT I WAS WRONG my bad 😔",
-            "ok hold up i messed that up",
-            "nah wait that's on me",
-            "okay okay i was wrong there 😭"
-        ]
-        return Personality.format_message(random.choice(reactions))
+    def react_birthday(user_mention: str, guild_id: Optional[int] = None) -> str:
+        return catalog.render('birthday', guild_id, mention=user_mention)
     
     @staticmethod
-    def react_birthday(user_mention: str) -> str:
-        return Personality.format_message(f"ITS {user_mention} DAY 🎉 everyone say something nice or i WILL cry")
+    def react_checkin(guild_id: Optional[int] = None) -> str:
+        return catalog.render('checkin', guild_id)
+
+# Slots each catalog line is rendered with, lines for any other key get none
+RESPONSE_SLOTS = {
+    'birthday': {'mention'},
+    'birthday_wishes': {'wishes'},
+    'birthday_set': {'date'},
+    'game21_start': {'hand', 'total', 'dealer'},
+    'game21_drew': {'hand', 'total'},
+    'game21_over': {'hand', 'total', 'dealer_hand', 'dealer_total', 'reaction'},
+    'trivia_start': {'question'},
+    'trivia_no_questions': {'categories'},
+    'rps': {'choice', 'bot_choice', 'reaction'},
+    'tictactoe_challenge': {'opponent'},
+    'vibes': {'user', 'points'},
+    'blacklisted': {'user'},
+    'unblacklisted': {'user'},
+    'persona_set': {'pack'},
+    'persona_unknown': {'packs'},
+    'profile_started': {'threshold'},
+    'profile_saved': {'path'},
+    'profile_save_failed': {'error'},
+    'profile_status': {'state', 'samples', 'stalls'},
+}
+
+# Every line the code renders, default.json has to have all of them
+RESPONSE_KEYS = set(RESPONSE_SLOTS) | {
+    'win', 'loss', 'tie', 'mistake', 'checkin', '8ball', 'help', 'admin_only',
+    'birthday_invalid', 'birthday_wish_saved', 'game_running', 'game21_none', 'game21_none_hit',
+    'game21_wrong_game', 'trivia_none', 'trivia_wrong_game', 'trivia_taken', 'trivia_timeout',
+    'trivia_wrong', 'tictactoe_self', 'profile_not_running',
+}
+
+class ResponseSet:
+    """One catalog entry: templates normalized at load time plus cumulative weights"""
+    
+    def __init__(self, lines: List[Tuple[str, float, bool]]):
+        texts, templated, cum_weights, total = [], [], [], 0
+        for text, weight, has_slots in lines:
+            texts.append(text)
+            templated.append(has_slots)
+            total += weight
+            cum_weights.append(total)
+        self.texts = tuple(texts)
+        self.templated = tuple(templated)
+        self.cum_weights = tuple(cum_weights)
+    
+    @staticmethod
+    def parse_line(entry, slots) -> Tuple[str, float, bool]:
+        """Normalize one line (a string or {"text", "weight"}), raises ValueError if it's bad"""
+        if isinstance(entry, str):
+            entry = {'text': entry}
+        if not isinstance(entry, dict) or not isinstance(entry.get('text'), str):
+            raise ValueError('a line has to be text or {"text": ..., "weight": ...}')
+        weight = entry.get('weight', 1)
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or not math.isfinite(weight) or weight <= 0:
+            raise ValueError(f'weight {weight!r} has to be a finite positive number')
+        
+        text = Personality.format_message(entry['text'])
+        has_slots = False
+        for _, field, spec, conversion in string.Formatter().parse(text):
+            if field is None:
+                continue
+            if field not in slots:
+                raise ValueError(f'unknown slot {{{field}}} in {text!r}')
+            if spec or conversion:
+                raise ValueError(f'slots are plain {{name}}s, no formatting allowed in {text!r}')
+            has_slots = True
+        # Lines without slots are never formatted, so unescape {{ }} now
+        return (text if has_slots else text.format()), weight, has_slots
+    
+    def pick(self, last: Optional[int] = None) -> int:
+        """Weighted pick of an index that isn't last"""
+        if len(self.texts) == 1:
+            return 0
+        total = self.cum_weights[-1]
+        if last is None:
+            return bisect.bisect_right(self.cum_weights, random.random() * total)
+        # Draw from the total minus last's weight, then hop over last's slice
+        start = self.cum_weights[last - 1] if last else 0
+        weight = self.cum_weights[last] - start
+        if total - weight <= 0:
+            return last
+        r = random.random() * (total - weight)
+        if r >= start:
+            r += weight
+        return bisect.bisect_right(self.cum_weights, r)
+
+class ResponseCatalog:
+    """All of chiChi's lines, loaded once from responses/*.json
+    
+    default.json has every line. Any other file is a persona pack that only
+    lists the lines it changes, everything else is shared with default.
+    """
+    
+    def __init__(self, directory: str = RESPONSES_DIR):
+        self.directory = directory
+        self.packs: Dict[str, ChainMap] = {}
+        self.guild_packs: Dict[int, str] = {}
+        self.last_picks: Dict[Tuple[Optional[int], str], int] = {}
+        self.load()
     
     @staticmethod
-    def react_checkin() -> str:
-        prompts = [
-            "hey... how's everyone doin lately? 😊\nrandom thought: what song are you stuck on rn?",
-            "okay okay who's still alive here? 👀\nwhat's everyone up to?",
-            "hey friends 😊 been quiet lately... what's good?",
-            "ok random check in time 👀 how's everyone's week been?"
-        ]
-        return Personality.format_message(random.choice(prompts))
+    def _read(path: str, strict: bool) -> Dict[str, ResponseSet]:
+        """Load one file. Bad lines are skipped with a warning, or raise if strict"""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError('expected a json object of lines')
+        
+        responses = {}
+        for key, entries in data.items():
+            if key not in RESPONSE_KEYS:
+                if strict:
+                    raise ValueError(f'{path}: unknown line {key!r}')
+                print(f'Skipping unknown line {key!r} in {path}')
+                continue
+            lines = []
+            for entry in entries if isinstance(entries, list) else [entries]:
+                try:
+                    lines.append(ResponseSet.parse_line(entry, RESPONSE_SLOTS.get(key, ())))
+                except ValueError as e:
+                    if strict:
+                        raise ValueError(f'{path}: bad line for {key!r}: {e}')
+                    print(f'Skipping bad line for {key!r} in {path}: {e}')
+            if lines:
+                responses[key] = ResponseSet(lines)
+            elif strict:
+                raise ValueError(f'{path}: no lines for {key!r}')
+        return responses
+    
+    def load(self):
+        # default.json has to be right, a broken pack just gets skipped
+        base = self._read(os.path.join(self.directory, 'default.json'), strict=True)
+        missing = RESPONSE_KEYS - set(base)
+        if missing:
+            raise ValueError(f"default.json is missing lines for {', '.join(sorted(missing))}")
+        packs = {'default': ChainMap(base)}
+        for name in sorted(os.listdir(self.directory)):
+            pack = name[:-5].lower()
+            if not name.endswith('.json') or pack == 'default':
+                continue
+            try:
+                packs[pack] = ChainMap(self._read(os.path.join(self.directory, name), strict=False), base)
+            except (OSError, ValueError) as e:
+                print(f'Skipping persona pack {name}: {e}')
+        self.packs = packs
+        self.last_picks.clear()
+    
+    def set_guild_pack(self, guild_id: int, pack: str):
+        self.guild_packs[guild_id] = pack
+        for key in [key for key in self.last_picks if key[0] == guild_id]:
+            del self.last_picks[key]
+    
+    def render(self, key: str, guild_id: Optional[int] = None, **slots) -> str:
+        pack = self.packs.get(self.guild_packs.get(guild_id), self.packs['default'])
+        entry = pack[key]
+        index = 0
+        if len(entry.texts) > 1:
+            index = entry.pick(self.last_picks.get((guild_id, key)))
+            self.last_picks[(guild_id, key)] = index
+        text = entry.texts[index]
+        return text.format(**slots) if entry.templated[index] else text
+
+catalog = ResponseCatalog()
 
 # Database helper
 class Database:
@@ -195,6 +360,26 @@ class Database:
         result = c.fetchone()
         conn.close()
         return result is not None
+    
+    @staticmethod
+    def get_guild_packs() -> Dict[int, str]:
+        conn = Database.get_connection()
+        c = conn.cursor()
+        c.execute('SELECT guild_id, pack FROM guild_personas')
+        results = c.fetchall()
+        conn.close()
+        return dict(results)
+    
+    @staticmethod
+    def set_guild_pack(guild_id: int, pack: str):
+        conn = Database.get_connection()
+        c = conn.cursor()
+        if pack == 'default':
+            c.execute('DELETE FROM guild_personas WHERE guild_id = ?', (guild_id,))
+        else:
+            c.execute('INSERT OR REPLACE INTO guild_personas (guild_id, pack) VALUES (?, ?)', (guild_id, pack))
+        conn.commit()
+        conn.close()
 
 # Game implementations
 class Game21:
@@ -262,49 +447,20 @@ class Game21:
 class Magic8Ball:
     """Magic 8-ball responses"""
     
-    responses = [
-        "yeah lowkey yes",
-        "nah i wouldn't risk it 😬",
-        "ask again after snacks",
-        "okay okay probably",
-        "nah that's a no from me",
-        "yeah go for it",
-        "ok wait let me think... maybe?",
-        "nah that's sus",
-        "yeah that sounds good",
-        "okay okay i'm not sure but probably yes",
-        "nah i'm too sleepy to answer properly 😴",
-        "yeah lowkey that's a good idea",
-        "okay okay i think so",
-        "nah that's not it",
-        "yeah probably",
-        "ok wait that's actually a maybe",
-        "nah i don't think so",
-        "yeah go ahead",
-        "okay okay i'm feeling yes on this one",
-        "nah that's a hard pass"
-    ]
-    
     @staticmethod
-    def respond() -> str:
-        return Personality.format_message(random.choice(Magic8Ball.responses))
+    def respond(guild_id: Optional[int] = None) -> str:
+        return catalog.render('8ball', guild_id)
 
 class TriviaGame:
     """Sudden-death trivia"""
     
-    questions = [
-        {"q": "what's the capital of france?", "a": "paris", "options": ["paris", "london", "berlin", "madrid"]},
-        {"q": "how many sides does a triangle have?", "a": "3", "options": ["3", "4", "5", "6"]},
-        {"q": "what planet do we live on?", "a": "earth", "options": ["earth", "mars", "venus", "jupiter"]},
-        {"q": "what's 2 + 2?", "a": "4", "options": ["3", "4", "5", "6"]},
-        {"q": "what color do you get when you mix red and blue?", "a": "purple", "options": ["purple", "green", "orange", "yellow"]},
-        {"q": "how many hours are in a day?", "a": "24", "options": ["12", "24", "36", "48"]},
-        {"q": "what's the largest ocean?", "a": "pacific", "options": ["atlantic", "pacific", "indian", "arctic"]},
-        {"q": "what animal says 'meow'?", "a": "cat", "options": ["dog", "cat", "bird", "cow"]},
-    ]
-    
-    def __init__(self):
-        self.question = random.choice(self.questions)
+    def __init__(self, question: Dict):
+        # Normalized once per game, the bank keeps whatever case it was given
+        self.question = {
+            'q': Personality.format_message(question['q']),
+            'a': Personality.format_message(question['a']),
+            'options': [Personality.format_message(option) for option in question['options']],
+        }
         self.answered = False
         self.winner = None
     
@@ -312,9 +468,9 @@ class TriviaGame:
         options_text = "\n".join([f"{i+1}. {opt}" for i, opt in enumerate(self.question['options'])])
         return f"{self.question['q']}\n{options_text}"
     
-    def check_answer(self, answer: str, user_id: int) -> Tuple[bool, str]:
+    def check_answer(self, answer: str, user_id: int, guild_id: Optional[int] = None) -> Tuple[bool, str]:
         if self.answered:
-            return False, Personality.format_message("okay okay someone already got it 😔")
+            return False, Personality.say('trivia_taken', guild_id)
         
         # Check if answer matches (number or text)
         answer_lower = answer.lower().strip()
@@ -328,7 +484,7 @@ class TriviaGame:
                 if selected == correct_answer:
                     self.answered = True
                     self.winner = user_id
-                    return True, Personality.react_win()
+                    return True, Personality.react_win(guild_id)
         except:
             pass
         
@@ -336,23 +492,429 @@ class TriviaGame:
         if answer_lower == correct_answer:
             self.answered = True
             self.winner = user_id
-            return True, Personality.react_win()
+            return True, Personality.react_win(guild_id)
         
-        return False, Personality.format_message("nah that's not it 😔")
+        return False, Personality.say('trivia_wrong', guild_id)
+
+# Used to seed the bank when there's no question file
+DEFAULT_TRIVIA = [
+    {"q": "what's the capital of france?", "a": "paris", "options": ["paris", "london", "berlin", "madrid"]},
+    {"q": "how many sides does a triangle have?", "a": "3", "options": ["3", "4", "5", "6"]},
+    {"q": "what planet do we live on?", "a": "earth", "options": ["earth", "mars", "venus", "jupiter"]},
+    {"q": "what's 2 + 2?", "a": "4", "options": ["3", "4", "5", "6"]},
+    {"q": "what color do you get when you mix red and blue?", "a": "purple", "options": ["purple", "green", "orange", "yellow"]},
+    {"q": "how many hours are in a day?", "a": "24", "options": ["12", "24", "36", "48"]},
+    {"q": "what's the largest ocean?", "a": "pacific", "options": ["atlantic", "pacific", "indian", "arctic"]},
+    {"q": "what animal says 'meow'?", "a": "cat", "options": ["dog", "cat", "bird", "cow"]},
+]
+
+class ShuffleCursor:
+    """Walks range(size) in a shuffled order without storing it.
+    
+    Small pools get an exact Fisher-Yates shuffle driven by the seed. Bigger
+    ones use a keyed Feistel network over the next power of two, cycle-walked
+    back into range. Either way every index comes up exactly once per round
+    and the whole state is size, seed and position.
+    """
+    
+    ROUNDS = 8
+    SMALL = 256  # Up to this size, rebuilding the full shuffle per pick is cheap
+    
+    def __init__(self, size: int, seed: Optional[int] = None, pos: int = 0):
+        self.size = size
+        self.half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self.pos = pos
+        self.seed = None
+        self.keys = ()
+        if seed is None:
+            self.reshuffle()
+        else:
+            self._set_seed(seed)
+    
+    @staticmethod
+    def _mix(x: int) -> int:
+        # Fixed 32-bit integer hash, so saved cursors mean the same thing after a restart
+        x &= 0xFFFFFFFF
+        x = ((x ^ (x >> 16)) * 0x7feb352d) & 0xFFFFFFFF
+        x = ((x ^ (x >> 15)) * 0x846ca68b) & 0xFFFFFFFF
+        return x ^ (x >> 16)
+    
+    def _set_seed(self, seed: int):
+        self.seed = seed
+        self.keys = tuple(self._mix(seed + i) for i in range(self.ROUNDS))
+    
+    def _permute(self, x: int) -> int:
+        mask = (1 << self.half_bits) - 1
+        left, right = x >> self.half_bits, x & mask
+        for key in self.keys:
+            left, right = right, left ^ (self._mix(right ^ key) & mask)
+        return (left << self.half_bits) | right
+    
+    def _shuffled(self) -> List[int]:
+        order = list(range(self.size))
+        for i in range(self.size - 1, 0, -1):
+            j = self._mix(self.seed ^ self._mix(i)) % (i + 1)
+            order[i], order[j] = order[j], order[i]
+        return order
+    
+    def index(self, pos: int) -> int:
+        if self.size <= self.SMALL:
+            return self._shuffled()[pos]
+        x = self._permute(pos)
+        while x >= self.size:
+            x = self._permute(x)  # Cycle-walk until we land back in range
+        return x
+    
+    def reshuffle(self):
+        """Start a new round that doesn't open with the index the last one ended on"""
+        last = self.index(self.size - 1) if self.seed is not None else None
+        while True:
+            self._set_seed(random.getrandbits(32))
+            if self.size < 2 or self.index(0) != last:
+                break
+        self.pos = 0
+    
+    def next(self) -> int:
+        if self.pos >= self.size:
+            self.reshuffle()  # Everything's been asked, start a new round
+        index = self.index(self.pos)
+        self.pos += 1
+        return index
+    
+    def to_json(self) -> str:
+        return json.dumps([self.size, self.seed, self.pos])
+    
+    @staticmethod
+    def from_json(state: str) -> 'ShuffleCursor':
+        return ShuffleCursor(*json.loads(state))
+
+class QuestionBank:
+    """Trivia questions live in sqlite, only the ones actually asked get loaded"""
+    
+    @staticmethod
+    def _row(item: Dict) -> Tuple:
+        if not isinstance(item, dict):
+            raise ValueError('not a json object')
+        question, answer, options = item['q'], item['a'], item['options']
+        if not isinstance(options, list) or not all(isinstance(text, str) for text in [question, answer, *options]):
+            raise ValueError('q, a and options have to be text')
+        if answer.lower() not in [option.lower() for option in options]:
+            raise ValueError(f'answer {answer!r} is not one of the options')
+        return (str(item.get('category', 'general')).lower(), str(item.get('difficulty', 'easy')).lower(),
+                question, answer, json.dumps(options))
+    
+    @staticmethod
+    def _read(path: str):
+        """Stream rows from a JSON lines file, skipping bad lines"""
+        with open(path, encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield QuestionBank._row(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    print(f'Skipping trivia question on line {number} of {path}: {e!r}')
+    
+    @staticmethod
+    def _renumber(c):
+        """Give every question a dense position within each pool it belongs to"""
+        c.execute('''UPDATE trivia_questions
+                     SET pos_all = r.pos_all, pos_category = r.pos_category,
+                         pos_difficulty = r.pos_difficulty, pos_both = r.pos_both
+                     FROM (SELECT id,
+                                  ROW_NUMBER() OVER (ORDER BY id) - 1 AS pos_all,
+                                  ROW_NUMBER() OVER (PARTITION BY category ORDER BY id) - 1 AS pos_category,
+                                  ROW_NUMBER() OVER (PARTITION BY difficulty ORDER BY id) - 1 AS pos_difficulty,
+                                  ROW_NUMBER() OVER (PARTITION BY category, difficulty ORDER BY id) - 1 AS pos_both
+                           FROM trivia_questions) AS r
+                     WHERE trivia_questions.id = r.id''')
+    
+    @staticmethod
+    def _filter(category: Optional[str], difficulty: Optional[str]) -> Tuple[List[str], List, str]:
+        """WHERE clauses, params and position column for a pool"""
+        clauses, params = [], []
+        if category:
+            clauses.append('category = ?')
+            params.append(category.lower())
+        if difficulty:
+            clauses.append('difficulty = ?')
+            params.append(difficulty.lower())
+        column = 'pos_both' if category and difficulty else \
+                 'pos_category' if category else 'pos_difficulty' if difficulty else 'pos_all'
+        return clauses, params, column
+    
+    @staticmethod
+    def sync(path: str = TRIVIA_FILE):
+        """(Re)load the bank from a JSON lines file if it changed, or seed it if it's empty"""
+        insert = ('INSERT INTO trivia_questions (category, difficulty, question, answer, options) '
+                  'VALUES (?, ?, ?, ?, ?)')
+        conn = Database.get_connection()
+        try:
+            c = conn.cursor()
+            if os.path.exists(path):
+                stat = os.stat(path)
+                signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+                c.execute('SELECT signature FROM trivia_source WHERE path = ?', (path,))
+                result = c.fetchone()
+                if not result or result[0] != signature:
+                    # All one transaction, the old questions stay until the new file is read in full.
+                    # Rows are streamed so memory stays flat however big the file is
+                    c.execute('DELETE FROM trivia_questions')
+                    c.executemany(insert, QuestionBank._read(path))
+                    c.execute('SELECT 1 FROM trivia_questions LIMIT 1')
+                    if c.fetchone() is None:
+                        raise ValueError('no valid questions in the file')
+                    c.execute('DELETE FROM trivia_source')
+                    c.execute('INSERT INTO trivia_source (path, signature) VALUES (?, ?)', (path, signature))
+            else:
+                c.execute('SELECT 1 FROM trivia_questions LIMIT 1')
+                if c.fetchone() is None:
+                    c.executemany(insert, [QuestionBank._row(item) for item in DEFAULT_TRIVIA])
+            
+            # Renumber after an import, or if someone edited the table by hand
+            c.execute('SELECT COUNT(*), COUNT(pos_all), MAX(pos_all) FROM trivia_questions')
+            total, numbered, last = c.fetchone()
+            if numbered != total or (total and last != total - 1):
+                QuestionBank._renumber(c)
+            conn.commit()
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f'Failed to load trivia questions from {path}, keeping the old ones: {e}')
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def count(category: Optional[str] = None, difficulty: Optional[str] = None) -> int:
+        clauses, params, column = QuestionBank._filter(category, difficulty)
+        where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+        conn = Database.get_connection()
+        c = conn.cursor()
+        c.execute(f'SELECT MAX({column}) FROM trivia_questions{where}', params)
+        result = c.fetchone()
+        conn.close()
+        return 0 if result[0] is None else result[0] + 1
+    
+    @staticmethod
+    def categories() -> List[str]:
+        conn = Database.get_connection()
+        c = conn.cursor()
+        c.execute('SELECT DISTINCT category FROM trivia_questions ORDER BY category')
+        results = c.fetchall()
+        conn.close()
+        return [row[0] for row in results]
+    
+    @staticmethod
+    def next_question(channel_id: int, category: Optional[str] = None,
+                      difficulty: Optional[str] = None) -> Optional[Dict]:
+        """Pick the channel's next question, no repeats until the whole pool has been asked"""
+        clauses, params, column = QuestionBank._filter(category, difficulty)
+        pool = f"trivia:{(category or '').lower()}:{(difficulty or '').lower()}"
+        
+        size = QuestionBank.count(category, difficulty)
+        if not size:
+            return None
+        
+        conn = Database.get_connection()
+        c = conn.cursor()
+        c.execute('SELECT state FROM game_states WHERE channel_id = ? AND game_type = ?', (channel_id, pool))
+        result = c.fetchone()
+        cursor = ShuffleCursor.from_json(result[0]) if result else None
+        if cursor is None or cursor.size != size:
+            cursor = ShuffleCursor(size)  # Bank changed size, start over
+        index = cursor.next()
+        
+        c.execute(f'SELECT question, answer, options FROM trivia_questions WHERE {" AND ".join(clauses + [f"{column} = ?"])}',
+                  params + [index])
+        row = c.fetchone()
+        if row is None:
+            # The table was edited by hand since startup, fix the positions and try again
+            QuestionBank._renumber(c)
+            conn.commit()
+            conn.close()
+            return QuestionBank.next_question(channel_id, category, difficulty)
+        question, answer, options = row
+        c.execute('INSERT OR REPLACE INTO game_states (channel_id, game_type, state) VALUES (?, ?, ?)',
+                  (channel_id, pool, cursor.to_json()))
+        conn.commit()
+        conn.close()
+        return {"q": question, "a": answer, "options": json.loads(options)}
 
 # Active game states
 active_games: Dict[int, any] = {}
 
+# Profiling (opt-in with CHICHI_PROFILE=1 or /profile)
+PROFILE_DIR = os.getenv('CHICHI_PROFILE_DIR', 'profiles')
+
+def stall_threshold_ms() -> int:
+    """CHICHI_STALL_MS, falling back to 250 if it isn't a number and never below 10 so the watchdog can't spin"""
+    try:
+        return max(10, int(os.getenv('CHICHI_STALL_MS', '250')))
+    except ValueError:
+        print('CHICHI_STALL_MS has to be a whole number of milliseconds, using 250')
+        return 250
+
+STALL_THRESHOLD_MS = stall_threshold_ms()
+
+def frame_label(frame) -> str:
+    """Short name for a stack frame, safe to use in collapsed stacks"""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ',')
+
+def collapse_stack(frame) -> str:
+    """Turn a frame into a root-first, semicolon separated stack"""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+def find_handler(frame) -> str:
+    """Find the outermost chiChi coroutine on the stack (the command or task that's running)"""
+    handler = None
+    while frame is not None:
+        code = frame.f_code
+        if code.co_flags & inspect.CO_COROUTINE and code.co_filename == __file__:
+            handler = code.co_name
+        frame = frame.f_back
+    return handler or 'unknown'
+
+class SamplingProfiler:
+    """Samples the event loop thread and writes collapsed stacks for flame graphs"""
+    
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.thread_id = None
+        self.started_at = None
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Start sampling the calling thread (call this from the event loop)"""
+        if self.running:
+            return
+        self.thread_id = threading.get_ident()
+        self.samples.clear()
+        self.started_at = datetime.now()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='chichi-profiler', daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[collapse_stack(frame)] += 1
+    
+    def stop(self) -> Optional[str]:
+        """Stop sampling and write the collapsed stacks, returns the file path
+        
+        Raises OSError if the file can't be written. The samples are kept, so
+        calling stop again retries the write.
+        """
+        if self.running:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        elif self.started_at is None:
+            return None  # Nothing recorded since the last save
+        
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"chichi-{self.started_at:%Y%m%d-%H%M%S}.folded")
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        self.started_at = None
+        return path
+
+class LoopWatchdog:
+    """Logs the handler and stack whenever something blocks the event loop too long"""
+    
+    def __init__(self, threshold_ms: int = STALL_THRESHOLD_MS):
+        self.threshold = max(10, threshold_ms) / 1000
+        self.last_beat = time.monotonic()
+        self.thread_id = None
+        self.stalls = 0
+        self._heartbeat = None
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Start watching the running event loop (call this from the event loop)"""
+        if self.running:
+            return
+        self.thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self._stop_event.clear()
+        self._heartbeat = asyncio.get_running_loop().create_task(self._beat())
+        self._thread = threading.Thread(target=self._watch, name='chichi-watchdog', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        if not self.running:
+            return
+        self._stop_event.set()
+        self._heartbeat.cancel()
+        self._thread.join()
+        self._thread = None
+    
+    async def _beat(self):
+        # If this stops ticking, something is hogging the loop
+        while True:
+            self.last_beat = time.monotonic()
+            await asyncio.sleep(self.threshold / 4)
+    
+    def _watch(self):
+        reported = None
+        while not self._stop_event.wait(self.threshold / 4):
+            beat = self.last_beat
+            stalled = time.monotonic() - beat
+            if stalled < self.threshold or beat == reported:
+                continue
+            # Only report each stall once, while it's still happening
+            reported = beat
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.report(stalled, frame)
+    
+    def report(self, stalled: float, frame):
+        self.stalls += 1
+        stack = ''.join(traceback.format_stack(frame))
+        text = (f"[{datetime.now().isoformat()}] event loop blocked for {stalled * 1000:.0f}ms+ "
+                f"in {find_handler(frame)}\n{stack}\n")
+        print(text, end='')
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            with open(os.path.join(PROFILE_DIR, 'stalls.log'), 'a', encoding='utf-8') as f:
+                f.write(text)
+        except OSError:
+            pass  # Logging to stdout is enough
+
+profiler = SamplingProfiler()
+watchdog = LoopWatchdog()
+
 # Bot events
 @bot.event
 async def on_ready():
     print(f'{bot.user} has connected to Discord!')
     init_db()
+    QuestionBank.sync()
+    catalog.guild_packs = Database.get_guild_packs()
     try:
         synced = await tree.sync()
         print(f'Synced {len(synced)} command(s)')
     except Exception as e:
         print(f'Failed to sync commands: {e}')
+    if os.getenv('CHICHI_PROFILE') == '1':
+        profiler.start()
+        watchdog.start()
     check_in_task.start()
     birthday_check_task.start()
 
@@ -372,13 +934,13 @@ async def on_message(message):
             # Try to parse as answer (ignore slash commands and bot commands)
             content = message.content.strip().lower()
             if content and not content.startswith('/') and not content.startswith('!'):
-                correct, response = game.check_answer(content, message.author.id)
+                correct, response = game.check_answer(content, message.author.id, message.guild and message.guild.id)
                 if correct:
                     Database.add_vibe_points(message.author.id, 15)
                     await message.channel.send(f"{message.author.mention} {response}")
                     if message.channel.id in active_games:
                         del active_games[message.channel.id]
-                elif "not it" in response.lower():
+                else:
                     await message.channel.send(response)
     
     # React to messages with emojis occasionally
@@ -395,22 +957,7 @@ async def on_message(message):
 # Slash Commands
 @tree.command(name="help", description="show all chiChi commands")
 async def help_command(interaction: discord.Interaction):
-    help_text = """
-**chiChi commands:**
-
-`/birthday-set` - set your birthday
-`/birthday-wish` - leave a birthday wish
-`/game21` - play 21 vibes (blackjack-lite)
-`/8ball` - ask the magic 8-ball
-`/trivia` - start sudden-death trivia
-`/rps` - rock paper scissors
-`/tictactoe` - challenge someone to tic-tac-toe
-`/vibes` - check your vibe points
-`/checkin` - manually trigger a check-in
-
-that's it! keep it simple 😊
-"""
-    await interaction.response.send_message(Personality.format_message(help_text))
+    await interaction.response.send_message(Personality.say('help', interaction.guild_id))
 
 @tree.command(name="birthday-set", description="set your birthday")
 @app_commands.describe(date="your birthday in format month/day (e.g., 12/25)")
@@ -420,142 +967,144 @@ async def birthday_set(interaction: discord.Interaction, date: str):
         if month < 1 or month > 12 or day < 1 or day > 31:
             raise ValueError
         Database.set_birthday(interaction.user.id, date)
-        await interaction.response.send_message(Personality.format_message(f"okay okay your birthday is set to {date} 🎉"))
+        await interaction.response.send_message(Personality.say('birthday_set', interaction.guild_id, date=date))
     except:
-        await interaction.response.send_message(Personality.format_message("okay okay that's not a valid date 😔 try like 12/25"))
+        await interaction.response.send_message(Personality.say('birthday_invalid', interaction.guild_id))
 
 @tree.command(name="birthday-wish", description="leave a birthday wish for someone")
 @app_commands.describe(user="the user to wish a happy birthday", message="your birthday wish message")
 async def birthday_wish(interaction: discord.Interaction, user: discord.Member, message: str):
     Database.add_birthday_wish(user.id, interaction.user.id, message)
-    await interaction.response.send_message(Personality.format_message(f"okay okay wish saved! 🎉"))
+    await interaction.response.send_message(Personality.say('birthday_wish_saved', interaction.guild_id))
 
 @tree.command(name="game21", description="play 21 vibes (blackjack-lite)")
 async def game_21(interaction: discord.Interaction):
     if interaction.channel.id in active_games:
-        await interaction.response.send_message(Personality.format_message("okay okay there's already a game going 😔"))
+        await interaction.response.send_message(Personality.say('game_running', interaction.guild_id))
         return
     
     game = Game21()
     active_games[interaction.channel.id] = game
     state = game.start_game()
     
-    msg = f"okay okay let's play 21 vibes! 🎮\n"
-    msg += f"your hand: {state['player_hand']} (total: {state['player_total']})\n"
-    msg += f"dealer shows: {state['dealer_visible']}\n"
-    msg += f"use `/hit` to draw or `/stand` to stop"
+    msg = Personality.say('game21_start', interaction.guild_id, hand=state['player_hand'],
+                          total=state['player_total'], dealer=state['dealer_visible'])
     
-    await interaction.response.send_message(Personality.format_message(msg))
+    await interaction.response.send_message(msg)
 
 @tree.command(name="hit", description="draw a card in 21 vibes")
 async def hit_command(interaction: discord.Interaction):
     if interaction.channel.id not in active_games:
-        await interaction.response.send_message(Personality.format_message("okay okay no game active 😔 start with /game21"))
+        await interaction.response.send_message(Personality.say('game21_none_hit', interaction.guild_id))
         return
     
     game = active_games[interaction.channel.id]
     if not isinstance(game, Game21):
-        await interaction.response.send_message(Personality.format_message("okay okay that's not a 21 game 😔"))
+        await interaction.response.send_message(Personality.say('game21_wrong_game', interaction.guild_id))
         return
     
     state = game.hit()
     
     if state['game_over']:
         del active_games[interaction.channel.id]
-        msg = f"game over!\n"
-        msg += f"your hand: {state['player_hand']} (total: {state['player_total']})\n"
-        msg += f"dealer hand: {state['dealer_hand']} (total: {state['dealer_total']})\n"
         
         if state['result'] == 'win':
-            msg += Personality.react_win()
+            reaction = Personality.react_win(interaction.guild_id)
             Database.add_vibe_points(interaction.user.id, 10)
         elif state['result'] == 'loss':
-            msg += Personality.react_loss()
+            reaction = Personality.react_loss(interaction.guild_id)
             Database.add_vibe_points(interaction.user.id, 5)
         else:
-            msg += Personality.react_tie()
+            reaction = Personality.react_tie(interaction.guild_id)
             Database.add_vibe_points(interaction.user.id, 7)
         
-        await interaction.response.send_message(Personality.format_message(msg))
+        msg = Personality.say('game21_over', interaction.guild_id, hand=state['player_hand'], total=state['player_total'],
+                              dealer_hand=state['dealer_hand'], dealer_total=state['dealer_total'], reaction=reaction)
+        await interaction.response.send_message(msg)
     else:
-        msg = f"you drew a card!\n"
-        msg += f"your hand: {state['player_hand']} (total: {state['player_total']})\n"
-        msg += f"use `/hit` or `/stand`"
-        await interaction.response.send_message(Personality.format_message(msg))
+        msg = Personality.say('game21_drew', interaction.guild_id, hand=state['player_hand'], total=state['player_total'])
+        await interaction.response.send_message(msg)
 
 @tree.command(name="stand", description="stop drawing cards in 21 vibes")
 async def stand_command(interaction: discord.Interaction):
     if interaction.channel.id not in active_games:
-        await interaction.response.send_message(Personality.format_message("okay okay no game active 😔"))
+        await interaction.response.send_message(Personality.say('game21_none', interaction.guild_id))
         return
     
     game = active_games[interaction.channel.id]
     if not isinstance(game, Game21):
-        await interaction.response.send_message(Personality.format_message("okay okay that's not a 21 game 😔"))
+        await interaction.response.send_message(Personality.say('game21_wrong_game', interaction.guild_id))
         return
     
     state = game.stand()
     del active_games[interaction.channel.id]
     
-    msg = f"game over!\n"
-    msg += f"your hand: {state['player_hand']} (total: {state['player_total']})\n"
-    msg += f"dealer hand: {state['dealer_hand']} (total: {state['dealer_total']})\n"
-    
     if state['result'] == 'win':
-        msg += Personality.react_win()
+        reaction = Personality.react_win(interaction.guild_id)
         Database.add_vibe_points(interaction.user.id, 10)
     elif state['result'] == 'loss':
-        msg += Personality.react_loss()
+        reaction = Personality.react_loss(interaction.guild_id)
         Database.add_vibe_points(interaction.user.id, 5)
     else:
-        msg += Personality.react_tie()
+        reaction = Personality.react_tie(interaction.guild_id)
         Database.add_vibe_points(interaction.user.id, 7)
     
-    await interaction.response.send_message(Personality.format_message(msg))
+    msg = Personality.say('game21_over', interaction.guild_id, hand=state['player_hand'], total=state['player_total'],
+                          dealer_hand=state['dealer_hand'], dealer_total=state['dealer_total'], reaction=reaction)
+    await interaction.response.send_message(msg)
 
 @tree.command(name="8ball", description="ask the magic 8-ball a question")
 @app_commands.describe(question="your question for the magic 8-ball")
 async def magic_8ball(interaction: discord.Interaction, question: str):
-    response = Magic8Ball.respond()
+    response = Magic8Ball.respond(interaction.guild_id)
     await interaction.response.send_message(response)
     Database.add_vibe_points(interaction.user.id, 2)
 
 @tree.command(name="trivia", description="start sudden-death trivia")
-async def trivia_command(interaction: discord.Interaction):
+@app_commands.describe(category="only ask questions from this category", difficulty="only ask questions this hard")
+@app_commands.choices(difficulty=[
+    app_commands.Choice(name="easy", value="easy"),
+    app_commands.Choice(name="medium", value="medium"),
+    app_commands.Choice(name="hard", value="hard")
+])
+async def trivia_command(interaction: discord.Interaction, category: str = None, difficulty: str = None):
     if interaction.channel.id in active_games:
-        await interaction.response.send_message(Personality.format_message("okay okay there's already a game going 😔"))
+        await interaction.response.send_message(Personality.say('game_running', interaction.guild_id))
         return
     
-    game = TriviaGame()
+    question = QuestionBank.next_question(interaction.channel.id, category, difficulty)
+    if question is None:
+        categories = ", ".join(QuestionBank.categories())
+        await interaction.response.send_message(Personality.say('trivia_no_questions', interaction.guild_id, categories=categories))
+        return
+    
+    game = TriviaGame(question)
     active_games[interaction.channel.id] = game
     
-    msg = f"okay okay sudden-death trivia! 🎮\n"
-    msg += f"first to answer correctly wins!\n\n"
-    msg += game.get_question()
-    msg += f"\n\nanswer with the number or the answer itself!"
+    msg = Personality.say('trivia_start', interaction.guild_id, question=game.get_question())
     
-    await interaction.response.send_message(Personality.format_message(msg))
+    await interaction.response.send_message(msg)
     
     # Auto-cleanup after 90 seconds
     await asyncio.sleep(90)
     if interaction.channel.id in active_games and isinstance(active_games[interaction.channel.id], TriviaGame):
         if not active_games[interaction.channel.id].answered:
-            await interaction.channel.send(Personality.format_message("okay okay time's up! no one got it 😔"))
+            await interaction.channel.send(Personality.say('trivia_timeout', interaction.guild_id))
         del active_games[interaction.channel.id]
 
 @tree.command(name="answer", description="answer the trivia question")
 @app_commands.describe(answer="your answer to the trivia question")
 async def answer_trivia(interaction: discord.Interaction, answer: str):
     if interaction.channel.id not in active_games:
-        await interaction.response.send_message(Personality.format_message("okay okay no trivia active 😔"))
+        await interaction.response.send_message(Personality.say('trivia_none', interaction.guild_id))
         return
     
     game = active_games[interaction.channel.id]
     if not isinstance(game, TriviaGame):
-        await interaction.response.send_message(Personality.format_message("okay okay that's not trivia 😔"))
+        await interaction.response.send_message(Personality.say('trivia_wrong_game', interaction.guild_id))
         return
     
-    correct, response = game.check_answer(answer, interaction.user.id)
+    correct, response = game.check_answer(answer, interaction.user.id, interaction.guild_id)
     
     if correct:
         Database.add_vibe_points(interaction.user.id, 15)
@@ -578,48 +1127,46 @@ async def rock_paper_scissors(interaction: discord.Interaction, choice: str):
     # Determine winner
     if choice == bot_choice:
         result = "tie"
-        reaction = Personality.react_tie()
+        reaction = Personality.react_tie(interaction.guild_id)
     elif (choice == 'rock' and bot_choice == 'scissors') or \
          (choice == 'paper' and bot_choice == 'rock') or \
          (choice == 'scissors' and bot_choice == 'paper'):
         result = "win"
-        reaction = Personality.react_win()
+        reaction = Personality.react_win(interaction.guild_id)
         Database.add_vibe_points(interaction.user.id, 5)
     else:
         result = "loss"
-        reaction = Personality.react_loss()
+        reaction = Personality.react_loss(interaction.guild_id)
         Database.add_vibe_points(interaction.user.id, 3)
     
-    msg = f"you chose: {choice}\n"
-    msg += f"i chose: {bot_choice}\n"
-    msg += reaction
+    msg = Personality.say('rps', interaction.guild_id, choice=choice, bot_choice=bot_choice, reaction=reaction)
     
-    await interaction.response.send_message(Personality.format_message(msg))
+    await interaction.response.send_message(msg)
 
 @tree.command(name="tictactoe", description="challenge someone to tic-tac-toe")
 @app_commands.describe(opponent="the person to challenge")
 async def tic_tac_toe(interaction: discord.Interaction, opponent: discord.Member):
     if opponent == interaction.user:
-        await interaction.response.send_message(Personality.format_message("okay okay you can't play yourself 😔"))
+        await interaction.response.send_message(Personality.say('tictactoe_self', interaction.guild_id))
         return
     
     # Simple tic-tac-toe implementation
-    await interaction.response.send_message(Personality.format_message(f"okay okay {opponent.mention} you've been challenged to tic-tac-toe! (coming soon - use /rps for now 😊)"))
+    await interaction.response.send_message(Personality.say('tictactoe_challenge', interaction.guild_id, opponent=opponent.mention))
 
 @tree.command(name="vibes", description="check vibe points")
 @app_commands.describe(user="the user to check (leave empty for yourself)")
 async def vibe_points(interaction: discord.Interaction, user: discord.Member = None):
     target = user or interaction.user
     points = Database.get_vibe_points(target.id)
-    await interaction.response.send_message(Personality.format_message(f"{target.mention} has {points} vibe points 😊"))
+    await interaction.response.send_message(Personality.say('vibes', interaction.guild_id, user=target.mention, points=points))
 
 @tree.command(name="checkin", description="manually trigger a check-in (admin only)")
 async def manual_checkin(interaction: discord.Interaction):
     if not interaction.user.guild_permissions.administrator:
-        await interaction.response.send_message(Personality.format_message("okay okay only admins can do that 😔"))
+        await interaction.response.send_message(Personality.say('admin_only', interaction.guild_id))
         return
     
-    await interaction.response.send_message(Personality.react_checkin())
+    await interaction.response.send_message(Personality.react_checkin(interaction.guild_id))
 
 # Scheduled tasks
 @tasks.loop(hours=24)
@@ -633,7 +1180,7 @@ async def check_in_task():
             # Only check-in in one channel per guild (usually the first text channel)
             for channel in guild.text_channels:
                 if channel.permissions_for(guild.me).send_messages:
-                    await channel.send(Personality.react_checkin())
+                    await channel.send(Personality.react_checkin(guild.id))
                     await asyncio.sleep(1)  # Rate limit protection
                     break  # Only one channel per guild
 
@@ -663,9 +1210,9 @@ async def birthday_check_task():
             if member:
                 for channel in guild.text_channels:
                     if channel.permissions_for(guild.me).send_messages:
-                        msg = Personality.react_birthday(member.mention)
+                        msg = Personality.react_birthday(member.mention, guild.id)
                         if wishes:
-                            msg += f"\n\nwishes:\n{wishes_text}"
+                            msg += "\n\n" + Personality.say('birthday_wishes', guild.id, wishes=wishes_text)
                         await channel.send(msg)
                         await asyncio.sleep(1)  # Rate limit protection
                         break
@@ -676,7 +1223,7 @@ async def birthday_check_task():
 @app_commands.describe(user="the user to blacklist")
 async def blacklist_user(interaction: discord.Interaction, user: discord.Member):
     if not interaction.user.guild_permissions.administrator:
-        await interaction.response.send_message(Personality.format_message("okay okay only admins can do that 😔"))
+        await interaction.response.send_message(Personality.say('admin_only', interaction.guild_id))
         return
     
     conn = Database.get_connection()
@@ -685,13 +1232,13 @@ async def blacklist_user(interaction: discord.Interaction, user: discord.Member)
     conn.commit()
     conn.close()
     
-    await interaction.response.send_message(Personality.format_message(f"okay okay {user.mention} is blacklisted"))
+    await interaction.response.send_message(Personality.say('blacklisted', interaction.guild_id, user=user.mention))
 
 @tree.command(name="unblacklist", description="remove a user from blacklist (admin only)")
 @app_commands.describe(user="the user to unblacklist")
 async def unblacklist_user(interaction: discord.Interaction, user: discord.Member):
     if not interaction.user.guild_permissions.administrator:
-        await interaction.response.send_message(Personality.format_message("okay okay only admins can do that 😔"))
+        await interaction.response.send_message(Personality.say('admin_only', interaction.guild_id))
         return
     
     conn = Database.get_connection()
@@ -700,7 +1247,56 @@ async def unblacklist_user(interaction: discord.Interaction, user: discord.Membe
     conn.commit()
     conn.close()
     
-    await interaction.response.send_message(Personality.format_message(f"okay okay {user.mention} is unblacklisted"))
+    await interaction.response.send_message(Personality.say('unblacklisted', interaction.guild_id, user=user.mention))
+
+@tree.command(name="profile", description="start or stop the profiler (admin only)")
+@app_commands.describe(action="what to do with the profiler")
+@app_commands.choices(action=[
+    app_commands.Choice(name="start", value="start"),
+    app_commands.Choice(name="stop", value="stop"),
+    app_commands.Choice(name="status", value="status")
+])
+async def profile_command(interaction: discord.Interaction, action: str):
+    if not interaction.user.guild_permissions.administrator:
+        await interaction.response.send_message(Personality.say('admin_only', interaction.guild_id))
+        return
+    
+    if action == "start":
+        profiler.start()
+        watchdog.start()
+        msg = Personality.say('profile_started', interaction.guild_id, threshold=STALL_THRESHOLD_MS)
+    elif action == "stop":
+        watchdog.stop()
+        try:
+            path = profiler.stop()
+        except OSError as e:
+            msg = Personality.say('profile_save_failed', interaction.guild_id, error=e)
+        else:
+            if path:
+                msg = Personality.say('profile_saved', interaction.guild_id, path=path)
+            else:
+                msg = Personality.say('profile_not_running', interaction.guild_id)
+    else:
+        msg = Personality.say('profile_status', interaction.guild_id, state="on" if profiler.running else "off",
+                              samples=sum(profiler.samples.values()), stalls=watchdog.stalls)
+    
+    await interaction.response.send_message(msg, ephemeral=True)
+
+@tree.command(name="persona", description="pick how chiChi talks in this server (admin only)")
+@app_commands.describe(pack="the persona pack to use (default to reset)")
+async def persona_command(interaction: discord.Interaction, pack: str):
+    if not interaction.user.guild_permissions.administrator:
+        await interaction.response.send_message(Personality.say('admin_only', interaction.guild_id))
+        return
+    
+    pack = pack.lower().strip()
+    if pack not in catalog.packs:
+        await interaction.response.send_message(Personality.say('persona_unknown', interaction.guild_id, packs=", ".join(catalog.packs)))
+        return
+    
+    Database.set_guild_pack(interaction.guild_id, pack)
+    catalog.set_guild_pack(interaction.guild_id, pack)
+    await interaction.response.send_message(Personality.say('persona_set', interaction.guild_id, pack=pack))
 
 # Run the bot
 if __name__ == '__main__':